@@ -1,9 +1,9 @@
-from flask import Flask, request, Response, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, send_file
 import logging
 import os
+import re
 # from datetime import datetime
-from utils.website_scraper import WebsiteScraper
-from utils.sitemap_generator import SitemapGenerator
+from utils.sitemap_jobs import SitemapJobQueue
 
 # Configuração do Flask
 app = Flask(__name__)
@@ -23,6 +23,12 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Padrão de URL aceita pelo endpoint
+_URL_RE = re.compile(r'^https?://[^\s<>"\'()[\]{}]+$')
+
+# Fila de geração de sitemaps em segundo plano
+job_queue = SitemapJobQueue()
+
 
 @app.route('/')
 def index():
@@ -38,8 +44,11 @@ def generate_sitemap():
     Aceita tanto GET quanto POST requests
     Parâmetro: website_url - URL do website
 
+    A geração roda em segundo plano; o resultado deve ser consultado em
+    /generate-sitemap/<job_id>
+
     Returns:
-        Response: XML do sitemap ou erro em JSON
+        Response: ID do job (202) ou erro em JSON
     """
     try:
         # Obter URL do website da requisição
@@ -58,10 +67,20 @@ def generate_sitemap():
                 return jsonify({
                     'error': 'Parâmetro website_url é obrigatório'
                 }), 400
-            max_depth = int(request.args.get('max_depth', 3))
+            max_depth = request.args.get('max_depth', 3)
             include_images = request.args.get(
                 'include_images', 'true').lower() == 'true'
 
+        # Validar profundidade (JSON pode trazer "2" ou null)
+        try:
+            max_depth = int(max_depth)
+        except (TypeError, ValueError):
+            max_depth = -1
+        if max_depth < 0:
+            return jsonify({
+                'error': 'max_depth deve ser um número inteiro não negativo'
+            }), 400
+
         logger.info(f"Iniciando geração de sitemap para: {website_url}")
 
         # Validar URL do website
@@ -71,35 +90,13 @@ def generate_sitemap():
                 'error': 'URL inválida. Use o formato: https://exemplo.com'
             }), 400
 
-        # Fazer scraping do website
-        scraper = WebsiteScraper(
-            max_depth=max_depth, include_images=include_images)
-        urls = scraper.scrape_website(website_url)
+        # Enfileirar scraping + geração do sitemap
+        job_id = job_queue.enqueue(website_url, max_depth, include_images)
 
-        if not urls:
-            logger.warning(
-                f"Nenhuma URL encontrada para o website: {website_url}")
-            return jsonify({
-                'error': 'Nenhuma página encontrada no website'
-            }), 404
-
-        # Gerar sitemap.xml
-        sitemap_generator = SitemapGenerator()
-        sitemap_xml = sitemap_generator.generate_sitemap(urls)
-
-        logger.info(
-            f"Sitemap gerado com sucesso para {website_url} - {
-                len(urls)} URLs encontradas")
-
-        # Retornar XML como resposta
-        return Response(
-            sitemap_xml,
-            mimetype='application/xml',
-            headers={
-                'Content-Disposition': 'attachment; filename=sitemap.xml',
-                'Content-Type': 'application/xml; charset=utf-8'
-            }
-        )
+        return jsonify({
+            'job_id': job_id,
+            'status_url': f'/generate-sitemap/{job_id}'
+        }), 202
 
     except Exception as e:
         logger.error(f"Erro ao gerar sitemap: {str(e)}", exc_info=True)
@@ -109,6 +106,39 @@ def generate_sitemap():
         }), 500
 
 
+@app.route('/generate-sitemap/<job_id>', methods=['GET'])
+def sitemap_status(job_id):
+    """
+    Consulta o estado de uma geração de sitemap
+
+    Args:
+        job_id (str): ID retornado por /generate-sitemap
+
+    Returns:
+        Response: XML do sitemap quando pronto, estado (202) ou erro em JSON
+    """
+    status = job_queue.get_status(job_id)
+    if status is None:
+        return jsonify({'error': 'Job não encontrado'}), 404
+
+    if status['status'] == 'pending':
+        return jsonify({'job_id': job_id, 'status': 'pending'}), 202
+
+    if status['status'] == 'failed':
+        error = {'error': status['error']}
+        if 'message' in status:
+            error['message'] = status['message']
+        return jsonify(error), status.get('http_status', 500)
+
+    # Retornar XML como resposta, transmitido a partir do arquivo em disco
+    return send_file(
+        os.path.abspath(job_queue.result_path(job_id)),
+        mimetype='application/xml',
+        as_attachment=True,
+        download_name='sitemap.xml'
+    )
+
+
 def _is_valid_url(url):
     """
     Valida se a URL é válida
@@ -119,9 +149,7 @@ def _is_valid_url(url):
     Returns:
         bool: True se válida, False caso contrário
     """
-    import re
-    pattern = r'^https?://[^\s<>"\'()[\]{}]+$'
-    return bool(re.match(pattern, url))
+    return bool(_URL_RE.match(url))
 
 
 @app.errorhandler(404)
@@ -134,6 +162,8 @@ def internal_error(error):
     return jsonify({'error': 'Erro interno do servidor'}), 500
 
 
+# Servidor de desenvolvimento; em produção use `gunicorn app:app`
+# (configurado em gunicorn.conf.py)
 if __name__ == '__main__':
     logger.info("Iniciando servidor Flask...")
     app.run(debug=True, host='0.0.0.0', port=5000)
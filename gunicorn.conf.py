@@ -0,0 +1,15 @@
+# Configuração do Gunicorn para produção
+# Uso: gunicorn app:app  (este arquivo é carregado automaticamente)
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Workers escalam a geração de XML (CPU) com os núcleos; threads permitem
+# vários scrapings (I/O) simultâneos em cada worker
+workers = int(os.environ.get('GUNICORN_WORKERS', min(4, multiprocessing.cpu_count())))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# O scraping de sites grandes pode levar vários segundos
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
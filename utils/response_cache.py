@@ -0,0 +1,283 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Cache LRU em memória de respostas HTTP, usado para requisições condicionais
+    (If-None-Match / If-Modified-Since) em gerações repetidas do mesmo site
+
+    Em vez do corpo HTML, cada entrada guarda os links e imagens já extraídos
+    da página: um 304 Not Modified dispensa um novo parsing.
+
+    Com path definido, as respostas também são gravadas em um banco SQLite,
+    de modo que o cache sobrevive a reinícios e é compartilhado entre os
+    processos do servidor. Falhas do banco (ex.: "database is locked") são
+    registradas no log e tratadas como ausência no cache ou gravação ignorada.
+    """
+
+    # Gravações entre duas limpezas do banco em disco
+    _PRUNE_INTERVAL = 1000
+
+    # Versão do formato da tabela (PRAGMA user_version)
+    _SCHEMA_VERSION = 2
+
+    def __init__(self, maxsize=10_000, ttl=3600, max_bytes=256 * 1024 * 1024,
+                 path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Limite para a soma dos links/imagens armazenados, em memória e em disco
+        self.max_bytes = max_bytes
+        self.path = path
+        self._entries: 'OrderedDict[Tuple[str, str], Dict]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # Lock separado para o banco: acertos em memória não esperam pelo disco
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+        if path:
+            try:
+                self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+                self._db.execute('PRAGMA journal_mode=WAL')
+                self._db.execute('PRAGMA synchronous=NORMAL')
+                version = self._db.execute('PRAGMA user_version').fetchone()[0]
+                if version != self._SCHEMA_VERSION:
+                    # Tabela em formato anterior (com corpos HTML): recriar
+                    self._db.execute('DROP TABLE IF EXISTS responses')
+                    self._db.execute(f'PRAGMA user_version = {self._SCHEMA_VERSION}')
+                self._db.execute(
+                    'CREATE TABLE IF NOT EXISTS responses ('
+                    'method TEXT, url TEXT, etag TEXT, last_modified TEXT, '
+                    'headers TEXT, links TEXT, images TEXT, expires REAL, '
+                    'PRIMARY KEY (method, url))')
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Cache em disco indisponível ({path}): {str(e)}")
+                self._db = None
+            else:
+                with self._db_lock:
+                    self._prune()
+
+    def get(self, method: str, url: str) -> Optional[Dict]:
+        """
+        Obtém a resposta armazenada para uma requisição
+
+        Args:
+            method (str): Método HTTP
+            url (str): URL da requisição
+
+        Returns:
+            Dict: Entrada com etag, last_modified, headers, links e images, ou None
+        """
+        key = (method, url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry['expires'] < time.monotonic():
+                    self._remove(key)
+                    return None
+
+                self._entries.move_to_end(key)
+                return entry
+
+        if not self._db:
+            return None
+
+        entry = self._load(key)
+        if entry is not None:
+            with self._lock:
+                self._store(key, entry)
+        return entry
+
+    def set(self, method: str, url: str, headers: Dict[str, str],
+            links: Iterable[str] = (), images: Iterable[str] = ()):
+        """
+        Armazena uma resposta, desde que ela tenha validadores (ETag/Last-Modified)
+
+        Args:
+            method (str): Método HTTP
+            url (str): URL da requisição
+            headers (Dict[str, str]): Cabeçalhos da resposta
+            links (Iterable[str]): Links extraídos da página
+            images (Iterable[str]): URLs de imagens extraídas da página
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        links = tuple(links)
+        images = tuple(images)
+        size = sum(map(len, links)) + sum(map(len, images))
+        if size > self.max_bytes:
+            return
+
+        key = (method, url)
+        with self._lock:
+            self._store(key, {
+                'etag': etag,
+                'last_modified': last_modified,
+                'headers': headers,
+                'links': links,
+                'images': images,
+                'size': size,
+                'expires': time.monotonic() + self.ttl
+            })
+
+        if not self._db:
+            return
+
+        with self._db_lock:
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (method, url, etag, last_modified, json.dumps(dict(headers)),
+                     json.dumps(links), json.dumps(images), time.time() + self.ttl))
+                self._db.commit()
+            except sqlite3.Error as e:
+                # O cache é só uma otimização: a resposta continua valendo
+                logger.warning(f"Erro ao gravar no cache em disco ({url}): {str(e)}")
+                self._rollback()
+                return
+
+            self._writes += 1
+            if self._writes % self._PRUNE_INTERVAL == 0:
+                self._prune()
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """
+        Monta os cabeçalhos de requisição condicional para uma entrada
+
+        Args:
+            entry (Dict): Entrada do cache (ou None)
+
+        Returns:
+            Dict[str, str]: Cabeçalhos If-None-Match / If-Modified-Since
+        """
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def clear(self):
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+        if self._db:
+            with self._db_lock:
+                try:
+                    self._db.execute('DELETE FROM responses')
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Erro ao limpar o cache em disco: {str(e)}")
+
+    def _store(self, key: Tuple[str, str], entry: Dict):
+        """
+        Insere uma entrada na memória (o lock já deve estar adquirido)
+
+        Args:
+            key (Tuple[str, str]): Chave (método, URL)
+            entry (Dict): Entrada do cache
+        """
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = entry
+        self._size += entry['size']
+
+        # Remover as entradas menos usadas recentemente
+        while len(self._entries) > self.maxsize or self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _load(self, key: Tuple[str, str]) -> Optional[Dict]:
+        """
+        Busca uma entrada no banco em disco
+
+        Args:
+            key (Tuple[str, str]): Chave (método, URL)
+
+        Returns:
+            Dict: Entrada do cache ou None se ausente/expirada/ilegível
+        """
+        with self._db_lock:
+            try:
+                row = self._db.execute(
+                    'SELECT etag, last_modified, headers, links, images, expires '
+                    'FROM responses WHERE method = ? AND url = ?', key).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Erro ao ler do cache em disco ({key[1]}): {str(e)}")
+                return None
+        if row is None:
+            return None
+
+        etag, last_modified, headers, links, images, expires = row
+        remaining = expires - time.time()
+        if remaining <= 0:
+            return None
+
+        links = tuple(json.loads(links))
+        images = tuple(json.loads(images))
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': CaseInsensitiveDict(json.loads(headers)),
+            'links': links,
+            'images': images,
+            'size': sum(map(len, links)) + sum(map(len, images)),
+            'expires': time.monotonic() + remaining
+        }
+
+    def _prune(self):
+        """
+        Remove do banco em disco as entradas expiradas e as que passam de
+        maxsize ou de max_bytes, começando pelas que expiram antes (com _db_lock)
+        """
+        try:
+            self._db.execute('DELETE FROM responses WHERE expires < ?', (time.time(),))
+            self._db.execute(
+                'DELETE FROM responses WHERE rowid IN ('
+                'SELECT rowid FROM responses ORDER BY expires DESC LIMIT -1 OFFSET ?)',
+                (self.maxsize,))
+            self._db.execute(
+                'DELETE FROM responses WHERE rowid IN ('
+                'SELECT rowid FROM (SELECT rowid, SUM(length(headers) + length(links) '
+                '+ length(images)) OVER (ORDER BY expires DESC) AS total FROM responses) '
+                'WHERE total > ?)',
+                (self.max_bytes,))
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Erro ao limpar o cache em disco: {str(e)}")
+            self._rollback()
+
+    def _rollback(self):
+        """Desfaz a transação pendente após uma falha, liberando o banco (com _db_lock)."""
+        try:
+            self._db.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _remove(self, key: Tuple[str, str]):
+        """
+        Remove uma entrada (o lock já deve estar adquirido)
+
+        Args:
+            key (Tuple[str, str]): Chave (método, URL)
+        """
+        entry = self._entries.pop(key)
+        self._size -= entry['size']
@@ -1,10 +1,23 @@
 import xml.etree.ElementTree as ET
-from typing import List, Dict
+from typing import Any, List, Dict, Iterator
 import logging
+import re
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Regex básica para validação de URL
+_URL_RE = re.compile(r'^https?://[^\s<>"\'()[\]{}]+$')
+
+# Tabela de escape dos caracteres especiais XML
+_XML_TRANS = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&apos;'
+})
+
 
 class SitemapGenerator:
     """
@@ -15,48 +28,63 @@ class SitemapGenerator:
         # Namespace do protocolo sitemap
         self.sitemap_namespace = "http://www.sitemaps.org/schemas/sitemap/0.9"
 
-    def generate_sitemap(self, urls: List[Dict[str, str]]) -> str:
+    def generate_sitemap(self, urls: List[Dict[str, Any]], pretty: bool = False) -> str:
         """
         Gera um sitemap.xml válido baseado na lista de URLs
 
         Args:
             urls (List[Dict]): Lista de dicionários com informações das URLs
+            pretty (bool): Indentar o XML (por padrão sai compacto, com uma
+                quebra de linha por <url> para manter a pré-visualização legível)
 
         Returns:
-            str: XML do sitemap formatado
+            str: XML do sitemap
+        """
+        return ''.join(self.iter_sitemap(urls, pretty))
+
+    def iter_sitemap(self, urls: List[Dict[str, Any]], pretty: bool = False) -> Iterator[str]:
+        """
+        Gera o sitemap.xml em partes, sem montar o documento inteiro na memória
+
+        Args:
+            urls (List[Dict]): Lista de dicionários com informações das URLs
+            pretty (bool): Indentar o XML (por padrão sai compacto, com uma
+                quebra de linha por <url> para manter a pré-visualização legível)
+
+        Yields:
+            str: Trechos do XML (declaração, um elemento <url> por vez, fechamento)
         """
         try:
             logger.info(f"Gerando sitemap com {len(urls)} URLs")
 
-            # Criar elemento raiz do sitemap
-            urlset = ET.Element("urlset")
-            urlset.set("xmlns", self.sitemap_namespace)
+            # Declaração XML e elemento raiz do sitemap
+            yield ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                   f'<urlset xmlns="{self.sitemap_namespace}">\n')
 
             # Adicionar cada URL ao sitemap
             for url_info in urls:
-                url_element = self._create_url_element(url_info)
-                if url_element is not None:
-                    urlset.append(url_element)
+                url_entry = self._create_url_entry(url_info, pretty)
+                if url_entry is not None:
+                    yield url_entry
 
-            # Converter para string XML formatada
-            xml_string = self._format_xml(urlset)
+            yield '</urlset>\n'
 
             logger.info("Sitemap gerado com sucesso")
-            return xml_string
 
         except Exception as e:
             logger.error(f"Erro ao gerar sitemap: {str(e)}")
             raise
 
-    def _create_url_element(self, url_info: Dict[str, str]) -> ET.Element:
+    def _create_url_entry(self, url_info: Dict[str, Any], pretty: bool = False) -> str:
         """
-        Cria um elemento <url> para o sitemap
+        Cria o trecho XML de um elemento <url> do sitemap
 
         Args:
             url_info (Dict): Informações da URL
+            pretty (bool): Indentar o elemento
 
         Returns:
-            ET.Element: Elemento XML da URL
+            str: XML do elemento <url> ou None se a URL for inválida
         """
         try:
             # Validar se a URL é válida
@@ -65,29 +93,36 @@ class SitemapGenerator:
                     f"URL inválida ignorada: {url_info.get('url', 'N/A')}")
                 return None
 
-            # Criar elemento <url>
-            url_element = ET.Element("url")
+            # Buscadores ignoram a formatação; indentação só quando pedida,
+            # mas cada <url> fica em sua própria linha
+            if pretty:
+                open_tag, child, close_tag = '  <url>\n', '    ', '\n'
+            else:
+                open_tag, child, close_tag = '<url>', '', ''
 
             # Elemento obrigatório <loc>
-            loc = ET.SubElement(url_element, "loc")
-            loc.text = self._escape_xml(url_info['url'])
+            parts = [
+                open_tag,
+                f"{child}<loc>{self._escape_xml(url_info['url'])}</loc>{close_tag}"
+            ]
 
             # Elemento opcional <lastmod>
             if url_info.get('lastmod'):
-                lastmod = ET.SubElement(url_element, "lastmod")
-                lastmod.text = url_info['lastmod']
+                parts.append(
+                    f"{child}<lastmod>{url_info['lastmod']}</lastmod>{close_tag}")
 
             # Elemento opcional <changefreq>
             if url_info.get('changefreq'):
-                changefreq = ET.SubElement(url_element, "changefreq")
-                changefreq.text = url_info['changefreq']
+                parts.append(
+                    f"{child}<changefreq>{url_info['changefreq']}</changefreq>{close_tag}")
 
-            # Elemento opcional <priority>
-            if url_info.get('priority'):
-                priority = ET.SubElement(url_element, "priority")
-                priority.text = str(url_info['priority'])
+            # Elemento opcional <priority> (float, formatado só na saída)
+            if url_info.get('priority') is not None:
+                parts.append(
+                    f"{child}<priority>{float(url_info['priority']):.1f}</priority>{close_tag}")
 
-            return url_element
+            parts.append(f"{'  ' if pretty else ''}</url>\n")
+            return ''.join(parts)
 
         except Exception as e:
             logger.warning(
@@ -104,12 +139,7 @@ class SitemapGenerator:
         Returns:
             bool: True se válida, False caso contrário
         """
-        import re
-
-        # Regex básica para validação de URL
-        url_pattern = r'^https?://[^\s<>"\'()[\]{}]+$'
-
-        if not re.match(url_pattern, url):
+        if not _URL_RE.match(url):
             return False
 
         # Verificar se não é muito longa (limite do protocolo sitemap)
@@ -131,58 +161,8 @@ class SitemapGenerator:
         if not text:
             return ""
 
-        # Escapar caracteres especiais XML
-        text = text.replace("&", "&amp;")
-        text = text.replace("<", "&lt;")
-        text = text.replace(">", "&gt;")
-        text = text.replace('"', "&quot;")
-        text = text.replace("'", "&apos;")
-
-        return text
-
-    def _format_xml(self, root: ET.Element) -> str:
-        """
-        Formata o XML de forma legível
-
-        Args:
-            root (ET.Element): Elemento raiz do XML
-
-        Returns:
-            str: XML formatado como string
-        """
-        # Adicionar indentação para melhor legibilidade
-        self._indent_xml(root)
-
-        # Converter para string
-        xml_string = ET.tostring(root, encoding='unicode', method='xml')
-
-        # Adicionar declaração XML
-        xml_declaration = '<?xml version="1.0" encoding="UTF-8"?>\n'
-
-        return xml_declaration + xml_string
-
-    def _indent_xml(self, elem: ET.Element, level: int = 0):
-        """
-        Adiciona indentação ao XML para melhor legibilidade
-
-        Args:
-            elem (ET.Element): Elemento para indentar
-            level (int): Nível de indentação
-        """
-        indent = "\n" + level * "  "
-
-        if len(elem):
-            if not elem.text or not elem.text.strip():
-                elem.text = indent + "  "
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = indent
-            for child in elem:
-                self._indent_xml(child, level + 1)
-            if not child.tail or not child.tail.strip():
-                child.tail = indent
-        else:
-            if level and (not elem.tail or not elem.tail.strip()):
-                elem.tail = indent
+        # Escapar caracteres especiais XML em uma única passada
+        return text.translate(_XML_TRANS)
 
     def validate_sitemap(self, xml_content: str) -> Dict[str, any]:
         """
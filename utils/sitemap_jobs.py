@@ -0,0 +1,203 @@
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional
+
+from utils.website_scraper import WebsiteScraper
+from utils.sitemap_generator import SitemapGenerator
+
+logger = logging.getLogger(__name__)
+
+# IDs de job são UUID4 em hexadecimal
+_JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+class SitemapJobError(Exception):
+    """
+    Erro de geração de sitemap com o status HTTP a ser reportado ao cliente
+    """
+
+    def __init__(self, message: str, http_status: int = 500):
+        super().__init__(message)
+        self.http_status = http_status
+
+
+def generate_sitemap_task(website_url: str, max_depth: int = 3,
+                          include_images: bool = True) -> Iterator[str]:
+    """
+    Faz o scraping de um website e gera o XML do sitemap
+
+    Args:
+        website_url (str): URL do website
+        max_depth (int): Profundidade máxima do scraping
+        include_images (bool): Incluir imagens no sitemap
+
+    Returns:
+        Iterator[str]: Trechos do XML do sitemap
+
+    Raises:
+        SitemapJobError: Se nenhuma página for encontrada
+    """
+    scraper = WebsiteScraper(max_depth=max_depth, include_images=include_images)
+    urls = scraper.scrape_website(website_url)
+
+    if not urls:
+        logger.warning(f"Nenhuma URL encontrada para o website: {website_url}")
+        raise SitemapJobError('Nenhuma página encontrada no website', 404)
+
+    logger.info(
+        f"Scraping concluído para {website_url} - {len(urls)} URLs encontradas")
+    return SitemapGenerator().iter_sitemap(urls)
+
+
+class SitemapJobQueue:
+    """
+    Fila de geração de sitemaps em segundo plano
+
+    Os jobs rodam em um pool de threads e o estado/resultado de cada um é
+    gravado em disco, de modo que qualquer worker do servidor WSGI consegue
+    responder às consultas de status.
+    """
+
+    def __init__(self, jobs_dir='jobs', max_workers=4, ttl=3600):
+        self.jobs_dir = jobs_dir
+        self.ttl = ttl  # Tempo (s) que os resultados ficam disponíveis
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        if not os.path.exists(self.jobs_dir):
+            os.makedirs(self.jobs_dir)
+
+    def enqueue(self, website_url: str, max_depth: int = 3,
+                include_images: bool = True) -> str:
+        """
+        Enfileira a geração de um sitemap
+
+        Args:
+            website_url (str): URL do website
+            max_depth (int): Profundidade máxima do scraping
+            include_images (bool): Incluir imagens no sitemap
+
+        Returns:
+            str: ID do job
+        """
+        self._cleanup()
+
+        job_id = uuid.uuid4().hex
+        self._write_status(job_id, {'status': 'pending'})
+        self._executor.submit(self._run, job_id, website_url, max_depth,
+                              include_images)
+
+        logger.info(f"Job {job_id} enfileirado para {website_url}")
+        return job_id
+
+    def get_status(self, job_id: str) -> Optional[Dict]:
+        """
+        Obtém o estado de um job
+
+        Args:
+            job_id (str): ID do job
+
+        Returns:
+            Dict: Estado do job ('pending', 'done' ou 'failed') ou None se não existir
+        """
+        if not _JOB_ID_RE.match(job_id):
+            return None
+
+        try:
+            with open(self._status_path(job_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def result_path(self, job_id: str) -> str:
+        """
+        Caminho do arquivo XML gerado por um job
+
+        Args:
+            job_id (str): ID do job
+
+        Returns:
+            str: Caminho do sitemap.xml do job
+        """
+        return os.path.join(self.jobs_dir, f'{job_id}.xml')
+
+    def _run(self, job_id: str, website_url: str, max_depth: int,
+             include_images: bool):
+        """
+        Executa um job e grava seu resultado
+
+        Args:
+            job_id (str): ID do job
+            website_url (str): URL do website
+            max_depth (int): Profundidade máxima do scraping
+            include_images (bool): Incluir imagens no sitemap
+        """
+        try:
+            chunks = generate_sitemap_task(
+                website_url, max_depth, include_images)
+
+            # Gravar o XML em partes, sem montar o documento na memória
+            path = self.result_path(job_id)
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(chunks)
+            os.replace(tmp_path, path)
+            self._write_status(job_id, {'status': 'done'})
+
+        except SitemapJobError as e:
+            self._write_status(job_id, {
+                'status': 'failed',
+                'error': str(e),
+                'http_status': e.http_status
+            })
+
+        except Exception as e:
+            logger.error(f"Erro ao gerar sitemap (job {job_id}): {str(e)}",
+                         exc_info=True)
+            self._write_status(job_id, {
+                'status': 'failed',
+                'error': 'Erro interno do servidor',
+                'message': str(e),
+                'http_status': 500
+            })
+
+    def _status_path(self, job_id: str) -> str:
+        """
+        Caminho do arquivo de estado de um job
+
+        Args:
+            job_id (str): ID do job
+
+        Returns:
+            str: Caminho do arquivo JSON de estado
+        """
+        return os.path.join(self.jobs_dir, f'{job_id}.json')
+
+    def _write_status(self, job_id: str, status: Dict):
+        """
+        Grava o estado de um job de forma atômica
+
+        Args:
+            job_id (str): ID do job
+            status (Dict): Estado do job
+        """
+        path = self._status_path(job_id)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(status, f)
+        os.replace(tmp_path, path)
+
+    def _cleanup(self):
+        """Remove arquivos de jobs mais antigos que o TTL."""
+        limit = time.time() - self.ttl
+        for name in os.listdir(self.jobs_dir):
+            path = os.path.join(self.jobs_dir, name)
+            try:
+                if os.path.getmtime(path) < limit:
+                    os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,91 @@
+import re
+from typing import Dict, Optional
+from urllib.parse import urlparse, parse_qsl
+
+# Segmentos de caminho que são identificadores (números, UUIDs, hashes)
+_ID_SEGMENT_RE = re.compile(
+    r'^(?:\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{16,})$',
+    re.IGNORECASE)
+
+# Segmentos no formato de slug (ex.: meu-primeiro-post)
+_SLUG_SEGMENT_RE = re.compile(r'^[a-z0-9]+(?:[-_][a-z0-9]+)+$', re.IGNORECASE)
+
+
+class _Node:
+    """Nó da trie: um segmento de caminho e seus filhos."""
+
+    __slots__ = ('children', 'wildcard', 'dynamic')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        # Quantos filhos parecem valores dinâmicos ({id} ou slug)
+        self.dynamic = 0
+        # Preenchido quando os filhos passam do limite de cardinalidade
+        self.wildcard: Optional['_Node'] = None
+
+
+class URLPatternTrie:
+    """
+    Trie de segmentos de caminho que agrupa URLs em templates
+    (ex.: /posts/123 e /posts/456 -> /posts/{id})
+
+    Segmentos que parecem identificadores viram {id} direto; um nível (exceto
+    a raiz) com mais de max_children valores distintos, em sua maioria
+    identificadores ou slugs, passa a ser tratado como {*}. As URLs vistas
+    antes disso mantêm o template literal, o que limita a diferença a no
+    máximo max_children templates por nível.
+    """
+
+    def __init__(self, max_children=50):
+        self.max_children = max_children
+        self._root = _Node()
+
+    def classify(self, url: str) -> str:
+        """
+        Obtém o template de uma URL, registrando seus segmentos na trie
+
+        Args:
+            url (str): URL para classificar
+
+        Returns:
+            str: Template do caminho (com as chaves da query, se houver)
+        """
+        parsed = urlparse(url)
+        parts = []
+
+        node = self._root
+        for segment in parsed.path.split('/'):
+            if not segment:
+                continue
+            if _ID_SEGMENT_RE.match(segment):
+                segment = '{id}'
+
+            if node.wildcard is not None:
+                parts.append('{*}')
+                node = node.wildcard
+                continue
+
+            child = node.children.get(segment)
+            if child is None:
+                is_dynamic = segment == '{id}' or bool(_SLUG_SEGMENT_RE.match(segment))
+                if (node is not self._root
+                        and len(node.children) >= self.max_children
+                        and (node.dynamic + is_dynamic) * 2 > len(node.children) + 1):
+                    # Nível dinâmico: todos os valores caem no mesmo template
+                    node.wildcard = _Node()
+                    node.children.clear()
+                    parts.append('{*}')
+                    node = node.wildcard
+                    continue
+                child = node.children[segment] = _Node()
+                node.dynamic += is_dynamic
+
+            parts.append(segment)
+            node = child
+
+        template = '/' + '/'.join(parts)
+        if parsed.query:
+            # Apenas as chaves: ?page=2 e ?page=3 são o mesmo template
+            keys = sorted({key for key, _ in parse_qsl(parsed.query, keep_blank_values=True)})
+            template += '?' + '&'.join(keys)
+        return template
@@ -1,47 +1,291 @@
+import asyncio
+import codecs
+import email.utils
+import os
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import logging
+from collections import Counter
+from itertools import repeat
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import urljoin, urlparse, urlunparse
 from bs4 import BeautifulSoup
-import time
-from typing import List, Dict, Set
+from bs4.dammit import EncodingDetector
+from bs4.filter import ElementFilter
+from lxml import etree
+from typing import Any, Iterable, List, Dict, Mapping, Set, Optional, Tuple
 import re
 from datetime import datetime
 import mimetypes
+from utils.response_cache import ResponseCache
+from utils.url_patterns import URLPatternTrie
+
+try:
+    import brotli  # noqa: F401 (requests e aiohttp decodificam br com ele)
+    _ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    _ACCEPT_ENCODING = 'gzip, deflate'
 
 logger = logging.getLogger(__name__)
 
+# Tamanho máximo de HTML lido por página (bytes)
+MAX_HTML_BYTES = 2 * 1024 * 1024
+
+# Timeouts (s) de conexão e de leitura (entre pacotes), como a tupla do requests;
+# hosts inacessíveis falham rápido e TOTAL_TIMEOUT limita a requisição inteira
+CONNECT_TIMEOUT = 3
+READ_TIMEOUT = 10
+TOTAL_TIMEOUT = 30
+_CLIENT_TIMEOUT = aiohttp.ClientTimeout(total=TOTAL_TIMEOUT,
+                                        sock_connect=CONNECT_TIMEOUT,
+                                        sock_read=READ_TIMEOUT)
+
+# Cache compartilhado entre instâncias (cada requisição Flask cria um scraper);
+# SITEMAP_CACHE_PATH o mantém em disco entre execuções e processos
+_shared_response_cache = ResponseCache(path=os.environ.get('SITEMAP_CACHE_PATH'))
+
+# Charset declarado no Content-Type
+_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+# Padrões de imagens de fundo em CSS inline
+_BG_IMAGE_PATTERNS = (
+    re.compile(r'background-image:\s*url\(["\']?([^"\'()]+)["\']?\)', re.IGNORECASE),
+    re.compile(r'background:\s*[^;]*url\(["\']?([^"\'()]+)["\']?\)', re.IGNORECASE)
+)
+
+
+class _RelevantTagsFilter(ElementFilter):
+    """
+    Filtro de parsing do BeautifulSoup: só cria objetos Tag para elementos
+    de onde são extraídos links e imagens (e para o conteúdo deles)
+    """
+
+    TAGS = frozenset(('a', 'form', 'link', 'img', 'source', 'meta', 'script'))
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        if name in self.TAGS:
+            return True
+        # Estilos inline e atributos data-* podem conter imagens
+        return bool(attrs) and any(
+            attr == 'style' or attr.startswith('data-') for attr in attrs)
+
+
+_PARSE_ONLY = _RelevantTagsFilter()
+
+
+def _keywords_re(*keywords: str) -> re.Pattern:
+    """
+    Compila uma regex que encontra qualquer uma das palavras-chave
+
+    Args:
+        keywords (str): Palavras-chave (trechos de caminho)
+
+    Returns:
+        re.Pattern: Regex compilada
+    """
+    return re.compile('|'.join(map(re.escape, keywords)))
+
+
+@lru_cache(maxsize=65536)
+def _parsed(url: str):
+    """
+    Versão memoizada de urlparse (a mesma URL é analisada por vários filtros)
+
+    Args:
+        url (str): URL para analisar
+
+    Returns:
+        ParseResult: Componentes da URL
+    """
+    return urlparse(url)
+
+
+# Parâmetros de rastreamento removidos da query (utm_*, fbclid, gclid)
+_TRACKING_PARAM_RE = re.compile(r'^(?:utm_[^=]*|fbclid|gclid)(?:=|$)', re.IGNORECASE)
+
+# Portas padrão omitidas do netloc
+_DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+# Barras repetidas no caminho
+_SLASHES_RE = re.compile(r'/{2,}')
+
+
+@lru_cache(maxsize=65536)
+def _normalized(url: str) -> str:
+    """
+    Normaliza uma URL removendo fragmentos e parâmetros desnecessários
+    (memoizada: links de menus e rodapés se repetem em todas as páginas)
+
+    Args:
+        url (str): URL para normalizar
+
+    Returns:
+        str: URL normalizada
+    """
+    parsed = _parsed(url)
+
+    # Host em minúsculas e sem a porta padrão do esquema
+    netloc = parsed.netloc.lower()
+    default_port = _DEFAULT_PORTS.get(parsed.scheme)
+    if default_port and netloc.endswith(default_port):
+        netloc = netloc[:-len(default_port)]
+
+    # Colapsar barras repetidas ("/a//b" -> "/a/b")
+    path = parsed.path
+    if '//' in path:
+        path = _SLASHES_RE.sub('/', path)
+
+    # Query sem parâmetros de rastreamento e em ordem estável; os pares
+    # são mantidos como vieram, sem recodificação
+    query = parsed.query
+    if query:
+        query = '&'.join(sorted(
+            param for param in query.split('&')
+            if param and not _TRACKING_PARAM_RE.match(param)))
+
+    # Remover fragmento
+    normalized = urlunparse((
+        parsed.scheme,
+        netloc,
+        path,
+        parsed.params,
+        query,
+        ''  # Remover fragmento
+    ))
+
+    # Remover trailing slash para arquivos (mas manter para diretórios)
+    if normalized.endswith('/') and len(parsed.path) > 1 and '.' in parsed.path.split('/')[-1]:
+        normalized = normalized[:-1]
+
+    return normalized
+
+
+@lru_cache(maxsize=256)
+def _lxml_encoding(label: str) -> Optional[str]:
+    """
+    Obtém um nome de encoding aceito pelo libxml2 para um rótulo de charset
+    (ex.: "latin-1" só é reconhecido como "iso8859-1")
+
+    Args:
+        label (str): Charset informado pelo servidor ou pelo HTML
+
+    Returns:
+        str: Nome aceito pelo HTMLParser do lxml ou None se desconhecido
+    """
+    candidates = [label]
+    try:
+        candidates.append(codecs.lookup(label).name)
+    except LookupError:
+        pass
+
+    for candidate in candidates:
+        try:
+            etree.HTMLParser(encoding=candidate)
+            return candidate
+        except LookupError:
+            continue
+    return None
+
 
 class WebsiteScraper:
     """
     Classe responsável por fazer scraping de websites e extrair URLs relevantes
     """
 
-    def __init__(self, max_depth=3, include_images=True, delay=0.5):
+    # Palavras-chave de caminho usadas na classificação das URLs
+    _DAILY_RE = _keywords_re('/blog/', '/news/', '/posts/', '/articles/')
+    _WEEKLY_RE = _keywords_re('/products/', '/services/', '/portfolio/')
+    _IMPORTANT_RE = _keywords_re('/about/', '/contact/', '/services/', '/products/')
+    _CONTENT_RE = _keywords_re('/blog/', '/news/', '/articles/')
+    _HOME_PATHS = ('/', '/index.html', '/index.php')
+    _STATIC_EXTENSIONS = ('.css', '.js', '.pdf')
+    # Recursos que podem ser úteis no sitemap
+    _RESOURCE_EXTENSIONS = ('.css', '.js', '.xml', '.txt', '.pdf')
+    # Links que com certeza não são HTML: basta um HEAD para registrá-los
+    _NON_HTML_EXTENSIONS = _RESOURCE_EXTENSIONS + (
+        '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx')
+    # Indicadores de imagem no caminho (mesmo sem extensão clara)
+    _IMAGE_INDICATOR_RE = _keywords_re('image', 'img', 'photo', 'picture',
+                                       'thumb', 'avatar', 'icon')
+
+    def __init__(self, max_depth=3, include_images=True, delay=0.5,
+                 concurrency=64, max_per_host=8, probe_lastmod=False,
+                 use_bs4=False, per_template_cap: Optional[int] = None,
+                 response_cache: Optional[ResponseCache] = None):
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            # Respostas comprimidas: menos bytes na rede, descompressão em C
+            'Accept-Encoding': _ACCEPT_ENCODING
         })
+
+        # Pool de conexões keep-alive reutilizado por todas as requisições
+        adapter = HTTPAdapter(
+            pool_connections=64,
+            pool_maxsize=128,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
         self.max_depth = max_depth
         self.include_images = include_images
         self.delay = delay
+        self.concurrency = concurrency  # Número de workers da BFS
+        self.max_per_host = max_per_host  # Requisições simultâneas por host
+        # Enviar HEAD para obter o Last-Modified de URLs não buscadas no crawl
+        self.probe_lastmod = probe_lastmod
+        # Parsear com BeautifulSoup em vez de usar o lxml diretamente
+        self.use_bs4 = use_bs4
+        # Máximo de URLs buscadas por template (ex.: /posts/{id}); None = sem limite
+        self.per_template_cap = per_template_cap
+        self._url_patterns = URLPatternTrie()
+        self._template_counts: Counter = Counter()
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._parse_executor: Optional[ThreadPoolExecutor] = None
+        self.response_cache = (response_cache if response_cache is not None
+                               else _shared_response_cache)
         self.visited_urls = set()
         self.found_urls = set()
         self.found_images = set()  # Conjunto separado para imagens
+        # Links já resolvidos e validados, por href absoluto ou relativo à raiz
+        # (menus e rodapés repetem os mesmos hrefs em todas as páginas)
+        self._link_cache: Dict[str, Optional[str]] = {}
+        # lastmod (do Last-Modified) capturado nas respostas GET do crawl
+        self.url_meta: Dict[str, Optional[str]] = {}
         self.base_domain = None
+        self._base_prefix = None
+        # lastmod das URLs sem Last-Modified (data do scraping)
+        self._fallback_lastmod: Optional[str] = None
 
         # Extensões de arquivos para incluir no sitemap
         self.allowed_extensions = {
             '.html', '.htm', '.php', '.asp', '.aspx', '.jsp', '.cfm',
             '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx'
         }
+        self._allowed_ext_tuple = tuple(self.allowed_extensions)
 
         # Extensões de imagens (mais abrangente)
         self.image_extensions = {
             '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp',
             '.ico', '.tiff', '.tif', '.avif', '.jfif', '.pjpeg', '.pjp'
         }
-
-    def scrape_website(self, start_url: str) -> List[Dict[str, str]]:
+        self._image_ext_tuple = tuple(self.image_extensions)
+        # Extensões de imagem citadas na query (ex.: ?format=webp)
+        self._image_query_re = _keywords_re(
+            *(ext[1:] for ext in self.image_extensions))
+        # Caminhos de imagem entre aspas no conteúdo de <script>
+        self._script_image_re = re.compile(
+            r'["\']([^"\']*\.(?:'
+            + '|'.join(sorted(ext[1:] for ext in self.image_extensions))
+            + r'))["\']', re.IGNORECASE)
+
+    def scrape_website(self, start_url: str) -> List[Dict[str, Any]]:
         """
         Faz scraping de um website e extrai todas as URLs relevantes
 
@@ -52,17 +296,25 @@ class WebsiteScraper:
             List[Dict]: Lista de dicionários com informações das URLs
         """
         try:
+            # Caches de URL são limitados, mas não precisam sobreviver entre sites
+            _parsed.cache_clear()
+            _normalized.cache_clear()
+            self._link_cache.clear()
+            self._url_patterns = URLPatternTrie()
+            self._template_counts.clear()
+
             # Normalizar URL inicial
             start_url = self._normalize_url(start_url)
-            parsed_url = urlparse(start_url)
+            parsed_url = _parsed(start_url)
             self.base_domain = f"{parsed_url.scheme}://{parsed_url.netloc}"
+            self._base_prefix = self.base_domain + '/'
 
             logger.info(
                 f"Iniciando scraping de {start_url} com profundidade máxima {self.max_depth}")
             logger.info(f"Incluir imagens: {self.include_images}")
 
-            # Iniciar scraping recursivo
-            self._scrape_recursive(start_url, 0)
+            # Iniciar scraping concorrente (BFS assíncrona)
+            asyncio.run(self._scrape_async(start_url))
 
             # Combinar URLs de páginas e imagens
             all_urls = self.found_urls.copy()
@@ -71,18 +323,19 @@ class WebsiteScraper:
                 logger.info(f"Imagens encontradas: {len(self.found_images)}")
 
             # Converter URLs encontradas para formato do sitemap
-            url_list = []
-            for url in all_urls:
-                url_info = {
-                    'url': url,
-                    'lastmod': self._get_last_modified_date(url),
-                    'changefreq': self._determine_change_frequency(url),
-                    'priority': self._calculate_priority(url, start_url)
-                }
-                url_list.append(url_info)
+            self._fallback_lastmod = datetime.now().strftime('%Y-%m-%dT%H:%M:%S+00:00')
+            if self.probe_lastmod:
+                # Os HEADs das URLs não buscadas no crawl rodam em paralelo
+                # (o pool do HTTPAdapter comporta as 32 threads)
+                with ThreadPoolExecutor(max_workers=32) as executor:
+                    url_list = list(executor.map(
+                        self._build_url_info, all_urls, repeat(start_url)))
+            else:
+                url_list = [self._build_url_info(url, start_url)
+                            for url in all_urls]
 
             # Ordenar por prioridade (maior primeiro)
-            url_list.sort(key=lambda x: float(x['priority']), reverse=True)
+            url_list.sort(key=itemgetter('priority'), reverse=True)
 
             logger.info(
                 f"Scraping concluído: {len(url_list)} URLs encontradas")
@@ -95,215 +348,351 @@ class WebsiteScraper:
                 f"Erro ao fazer scraping do website {start_url}: {str(e)}")
             raise
 
-    def _scrape_recursive(self, url: str, depth: int):
+    async def _scrape_async(self, start_url: str):
+        """
+        Faz scraping do website em largura (BFS) com um pool de workers
+
+        Args:
+            start_url (str): URL inicial do website
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._host_semaphores = {}
+
+        # URLs são marcadas como visitadas ao entrar na fila, evitando
+        # que dois workers busquem a mesma página
+        self.visited_urls.add(start_url)
+        queue.put_nowait((start_url, 0))
+
+        # O semáforo por host já limita as requisições simultâneas; o pool
+        # segue o mesmo limite e o DNS resolvido é reaproveitado por 5 minutos
+        connector = aiohttp.TCPConnector(limit=self.concurrency,
+                                         limit_per_host=self.max_per_host,
+                                         ttl_dns_cache=300)
+        async with aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    'User-Agent': self.session.headers['User-Agent'],
+                    'Accept-Encoding': _ACCEPT_ENCODING
+                }) as session:
+            # O parsing do HTML roda em threads para não bloquear o event loop
+            # enquanto outras requisições estão em andamento
+            with ThreadPoolExecutor(max_workers=32) as executor:
+                self._parse_executor = executor
+                workers = [
+                    asyncio.create_task(self._worker(session, queue))
+                    for _ in range(self.concurrency)
+                ]
+
+                # Aguardar até que todas as URLs da fila sejam processadas
+                await queue.join()
+
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+            self._parse_executor = None
+
+    async def _worker(self, session: aiohttp.ClientSession, queue: asyncio.Queue):
+        """
+        Consome itens (url, profundidade) da fila e enfileira os links encontrados
+
+        Args:
+            session (aiohttp.ClientSession): Sessão HTTP compartilhada
+            queue (asyncio.Queue): Fila da BFS
+        """
+        while True:
+            url, depth = await queue.get()
+            try:
+                links = await self._scrape_page(session, url, depth)
+
+                # Links além da profundidade máxima nem entram na fila
+                if depth >= self.max_depth:
+                    continue
+
+                # Verificação e inserção no conjunto não têm await entre si,
+                # portanto são atômicas dentro do event loop
+                for link in links:
+                    if link not in self.visited_urls:
+                        if (self.per_template_cap is not None
+                                and not self._within_template_cap(link)):
+                            continue
+                        self.visited_urls.add(link)
+                        queue.put_nowait((link, depth + 1))
+            except Exception as e:
+                # Um erro inesperado não pode encerrar o worker em silêncio
+                logger.error(f"Erro ao processar {url}: {str(e)}", exc_info=True)
+            finally:
+                queue.task_done()
+
+    def _within_template_cap(self, url: str) -> bool:
+        """
+        Conta uma URL no seu template e verifica se o limite foi atingido
+
+        Args:
+            url (str): URL a ser enfileirada
+
+        Returns:
+            bool: True se a URL ainda cabe no limite do seu template
+        """
+        template = self._url_patterns.classify(url)
+        if self._template_counts[template] >= self.per_template_cap:
+            return False
+        self._template_counts[template] += 1
+        return True
+
+    async def _scrape_page(self, session: aiohttp.ClientSession, url: str,
+                           depth: int) -> Set[str]:
         """
-        Faz scraping recursivo de uma URL
+        Faz scraping de uma única URL
 
         Args:
+            session (aiohttp.ClientSession): Sessão HTTP compartilhada
             url (str): URL para fazer scraping
             depth (int): Profundidade atual
-        """
-        if depth > self.max_depth or url in self.visited_urls:
-            return
 
+        Returns:
+            Set[str]: Links do mesmo domínio encontrados na página
+        """
         try:
-            logger.info(f"Fazendo scraping de {url} (profundidade: {depth})")
-
-            # Marcar como visitada
-            self.visited_urls.add(url)
+            # Fazer requisição respeitando o limite por host (rate limiting)
+            async with self._host_semaphore(url):
+                await asyncio.sleep(self.delay)
+                status, headers, content, cached = await self._make_request(session, url)
 
-            # Fazer requisição
-            response = self._make_request(url)
-            if not response or response.status_code != 200:
-                logger.warning(
-                    f"Falha ao acessar {url}: status {response.status_code if response else 'None'}")
-                return
+            if status != 200:
+                logger.warning(f"Falha ao acessar {url}: status {status}")
+                return set()
 
             # Adicionar URL atual à lista
             self.found_urls.add(url)
+            self.url_meta[url] = self._format_http_date(headers.get('Last-Modified'))
 
             # Verificar se é uma página HTML
-            content_type = response.headers.get('content-type', '').lower()
-            if 'text/html' not in content_type:
-                logger.info(
-                    f"Pulando {url} - não é HTML (content-type: {content_type})")
-                return
-
-            # Parsear HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Extrair links para páginas
-            links = self._extract_links(soup, url)
-            logger.info(f"Encontrados {len(links)} links em {url}")
-
-            # Extrair imagens se solicitado
+            if not self._is_html_response(headers):
+                logger.debug("Pulando %s - não é HTML (content-type: %s)",
+                             url, headers.get('content-type', ''))
+                return set()
+
+            if cached is not None:
+                # 304 Not Modified: links e imagens extraídos na visita anterior
+                links, images = set(cached['links']), set(cached['images'])
+            elif not content:
+                # Página sem corpo
+                return set()
+            else:
+                # Parsear HTML e extrair links e imagens fora do event loop
+                links, images = await asyncio.get_running_loop().run_in_executor(
+                    self._parse_executor, self._parse_page, content, url,
+                    self._response_charset(headers))
+                await self._cache_set('GET', url, headers, links, images)
             if self.include_images:
-                images = self._extract_images(soup, url)
                 self.found_images.update(images)
-                logger.info(f"Encontradas {len(images)} imagens em {url}")
 
-            # Fazer scraping recursivo dos links encontrados
-            for link in links:
-                if self._is_same_domain(link) and link not in self.visited_urls:
-                    time.sleep(self.delay)  # Rate limiting
-                    self._scrape_recursive(link, depth + 1)
+            # Um único resumo por página (formatação adiada pelo logging)
+            logger.info("Página %s (profundidade %d): %d links, %d imagens",
+                        url, depth, len(links), len(images))
+
+            # _resolve_url já descarta links de outros sites
+            return links
 
         except Exception as e:
             logger.warning(f"Erro ao fazer scraping de {url}: {str(e)}")
+            return set()
+
+    def _parse_page(self, content: bytes, url: str,
+                    encoding: Optional[str] = None) -> Tuple[Set[str], Set[str]]:
+        """
+        Parseia o HTML de uma página e extrai seus links e imagens
+
+        Args:
+            content (bytes): Corpo HTML da página
+            url (str): URL da página
+            encoding (str): Charset informado pelo servidor (evita a detecção
+                automática de encoding)
+
+        Returns:
+            Tuple[Set[str], Set[str]]: Conjuntos de links e de URLs de imagens
+        """
+        if self.use_bs4:
+            soup = BeautifulSoup(content, 'lxml', from_encoding=encoding,
+                                 parse_only=_PARSE_ONLY)
+            try:
+                return self._extract_urls(
+                    ((tag.name, tag.attrs, tag.string)
+                     for tag in soup.find_all(True)), url)
+            finally:
+                # Desfazer as referências cíclicas da árvore para liberar a
+                # memória já aqui, sem esperar o coletor de lixo
+                soup.decompose()
+
+        # Charset do cabeçalho; se ausente ou desconhecido, o declarado no
+        # próprio HTML (<meta>) e, por fim, utf-8
+        encoding = encoding and _lxml_encoding(encoding)
+        if not encoding:
+            declared = EncodingDetector.find_declared_encoding(
+                content, is_html=True)
+            encoding = (declared and _lxml_encoding(declared)) or 'utf-8'
+
+        # lxml direto: sem os objetos do BeautifulSoup para cada tag
+        root = etree.fromstring(content, etree.HTMLParser(encoding=encoding))
+        if root is None:
+            return set(), set()
+        return self._extract_urls(
+            ((element.tag, element.attrib, element.text)
+             for element in root.iter(etree.Element)), url)
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """
+        Obtém o semáforo que limita as requisições simultâneas a um host
 
-    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> Set[str]:
+        Args:
+            url (str): URL da requisição
+
+        Returns:
+            asyncio.Semaphore: Semáforo do host da URL
         """
-        Extrai todos os links de uma página
+        netloc = _parsed(url).netloc
+        if netloc not in self._host_semaphores:
+            self._host_semaphores[netloc] = asyncio.Semaphore(
+                self.max_per_host)
+        return self._host_semaphores[netloc]
+
+    def _extract_urls(self, elements: Iterable[Tuple[str, Mapping[str, Any], Optional[str]]],
+                      base_url: str) -> Tuple[Set[str], Set[str]]:
+        """
+        Extrai links e imagens de uma página percorrendo as tags uma única vez
 
         Args:
-            soup (BeautifulSoup): Objeto BeautifulSoup da página
+            elements (Iterable[Tuple]): Tags da página como (nome, atributos, texto)
             base_url (str): URL base da página
 
         Returns:
-            Set[str]: Conjunto de URLs encontradas
+            Tuple[Set[str], Set[str]]: Conjuntos de links e de URLs de imagens
         """
         links = set()
+        images = set()
 
-        # Links de âncora
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-            full_url = self._resolve_url(href, base_url)
-            if full_url and self._is_valid_page_url(full_url):
-                links.add(full_url)
+        include_images = self.include_images
+
+        for name, attrs, text in elements:
+
+            # Links de âncora e de formulários
+            if name == 'a' or name == 'form':
+                href = attrs.get('href' if name == 'a' else 'action')
+                full_url = self._page_link(href, base_url) if href else None
+                if full_url:
+                    links.add(full_url)
+
+            # Links em elementos link (CSS, etc.) e ícones
+            elif name == 'link':
+                href = attrs.get('href')
+                if href:
+                    full_url = self._resolve_url(href, base_url)
+                    if full_url and self._is_valid_resource_url(full_url):
+                        links.add(full_url)
+
+                    if include_images:
+                        rel = attrs.get('rel', [])
+                        if isinstance(rel, list):
+                            rel = ' '.join(rel)
+                        if 'icon' in rel.lower():
+                            self._add_image(images, href, base_url, 'icon')
+
+            if not include_images:
+                continue
+
+            # Imagens em tags img (src, data-src para lazy loading e srcset)
+            if name == 'img':
+                self._add_image(images, attrs.get('src'), base_url, 'src')
+                self._add_image(images, attrs.get('data-src'), base_url, 'data-src')
+                for src in self._srcset_urls(attrs.get('srcset')):
+                    self._add_image(images, src, base_url, 'srcset')
+
+            # Imagens em elementos picture > source
+            elif name == 'source':
+                for src in self._srcset_urls(attrs.get('srcset')):
+                    self._add_image(images, src, base_url, 'picture source')
+
+            # Imagens em meta tags (og:image, twitter:image, etc.)
+            elif name == 'meta':
+                prop = attrs.get('property')
+                if prop in ('og:image', 'twitter:image', 'twitter:image:src'):
+                    self._add_image(images, attrs.get('content'), base_url,
+                                    f'meta {prop}')
+
+            # Padrões de URL de imagem em scripts JSON-LD ou outros scripts
+            elif name == 'script' and text:
+                for img_url in self._script_image_re.findall(text):
+                    self._add_image(images, img_url, base_url, 'script')
+
+            for attr, value in attrs.items():
+                # Imagens de fundo em CSS inline; a maioria dos estilos não
+                # tem url(), o que evita rodar as regexes
+                if attr == 'style':
+                    if 'url(' in value.lower():
+                        for pattern in _BG_IMAGE_PATTERNS:
+                            for match in pattern.finditer(value):
+                                self._add_image(images, match.group(1), base_url,
+                                                'CSS background')
+
+                # URLs de imagem em atributos data-* personalizados
+                elif attr.startswith('data-') and 'img' in attr.lower():
+                    self._add_image(images, value, base_url, 'data-* attr')
+
+        return links, images
+
+    def _page_link(self, href: str, base_url: str) -> Optional[str]:
+        """
+        Resolve e valida o link de uma página, reaproveitando o resultado de
+        hrefs que não dependem da página de origem
 
-        # Links de formulários
-        for form_tag in soup.find_all('form', action=True):
-            action = form_tag['action']
-            full_url = self._resolve_url(action, base_url)
-            if full_url and self._is_valid_page_url(full_url):
-                links.add(full_url)
+        Args:
+            href (str): Valor do atributo href/action
+            base_url (str): URL base da página
 
-        # Links em elementos link (CSS, etc.)
-        for link_tag in soup.find_all('link', href=True):
-            href = link_tag['href']
-            full_url = self._resolve_url(href, base_url)
-            if full_url and self._is_valid_resource_url(full_url):
-                links.add(full_url)
+        Returns:
+            str: URL absoluta do link ou None se inválido
+        """
+        shared = (href.startswith(('http://', 'https://'))
+                  or (href.startswith('/') and not href.startswith('//')))
+        if shared and href in self._link_cache:
+            return self._link_cache[href]
+
+        full_url = self._resolve_url(href, base_url)
+        if full_url and not self._is_valid_page_url(full_url):
+            full_url = None
 
-        return links
+        if shared:
+            self._link_cache[href] = full_url
+        return full_url
 
-    def _extract_images(self, soup: BeautifulSoup, base_url: str) -> Set[str]:
+    def _add_image(self, images: Set[str], src: str, base_url: str, origin: str):
         """
-        Extrai todas as imagens de uma página de forma mais abrangente
+        Resolve uma URL de imagem e a adiciona ao conjunto se for válida
 
         Args:
-            soup (BeautifulSoup): Objeto BeautifulSoup da página
+            images (Set[str]): Conjunto de URLs de imagens
+            src (str): URL da imagem (relativa ou absoluta)
             base_url (str): URL base da página
+            origin (str): Origem da imagem na página (para logging)
+        """
+        full_url = self._resolve_url(src, base_url)
+        if full_url and self._is_valid_image_url(full_url):
+            images.add(full_url)
+            logger.debug("Imagem encontrada (%s): %s", origin, full_url)
 
-        Returns:
-            Set[str]: Conjunto de URLs de imagens
+    def _srcset_urls(self, srcset: str) -> List[str]:
         """
-        images = set()
+        Extrai as URLs de um atributo srcset, ignorando os descritores
 
-        # 1. Imagens em tags img com src
-        for img_tag in soup.find_all('img', src=True):
-            src = img_tag['src']
-            full_url = self._resolve_url(src, base_url)
-            if full_url and self._is_valid_image_url(full_url):
-                images.add(full_url)
-                logger.debug(f"Imagem encontrada (src): {full_url}")
-
-        # 2. Imagens em tags img com data-src (lazy loading)
-        for img_tag in soup.find_all('img', attrs={'data-src': True}):
-            src = img_tag['data-src']
-            full_url = self._resolve_url(src, base_url)
-            if full_url and self._is_valid_image_url(full_url):
-                images.add(full_url)
-                logger.debug(f"Imagem encontrada (data-src): {full_url}")
-
-        # 3. Imagens em srcset
-        for img_tag in soup.find_all('img', srcset=True):
-            srcset = img_tag['srcset']
-            # Processar cada URL no srcset
-            for src_item in srcset.split(','):
-                # Pegar apenas a URL, ignorar o descritor
-                src = src_item.strip().split()[0]
-                full_url = self._resolve_url(src, base_url)
-                if full_url and self._is_valid_image_url(full_url):
-                    images.add(full_url)
-                    logger.debug(f"Imagem encontrada (srcset): {full_url}")
-
-        # 4. Imagens em elementos picture > source
-        for source_tag in soup.find_all('source', srcset=True):
-            srcset = source_tag['srcset']
-            for src_item in srcset.split(','):
-                src = src_item.strip().split()[0]
-                full_url = self._resolve_url(src, base_url)
-                if full_url and self._is_valid_image_url(full_url):
-                    images.add(full_url)
-                    logger.debug(
-                        f"Imagem encontrada (picture source): {full_url}")
-
-        # 5. Imagens de fundo em CSS inline
-        for element in soup.find_all(style=True):
-            style = element['style']
-            # Regex mais robusta para background-image
-            bg_patterns = [
-                r'background-image:\s*url\(["\']?([^"\'()]+)["\']?\)',
-                r'background:\s*[^;]*url\(["\']?([^"\'()]+)["\']?\)'
-            ]
-
-            for pattern in bg_patterns:
-                bg_images = re.findall(pattern, style, re.IGNORECASE)
-                for bg_image in bg_images:
-                    full_url = self._resolve_url(bg_image, base_url)
-                    if full_url and self._is_valid_image_url(full_url):
-                        images.add(full_url)
-                        logger.debug(
-                            f"Imagem encontrada (CSS background): {full_url}")
-
-        # 6. Imagens em tags link com rel="icon" ou rel="apple-touch-icon"
-        for link_tag in soup.find_all('link', href=True):
-            rel = link_tag.get('rel', [])
-            if isinstance(rel, list):
-                rel = ' '.join(rel)
-            if 'icon' in rel.lower():
-                href = link_tag['href']
-                full_url = self._resolve_url(href, base_url)
-                if full_url and self._is_valid_image_url(full_url):
-                    images.add(full_url)
-                    logger.debug(f"Imagem encontrada (icon): {full_url}")
-
-        # 7. Imagens em meta tags (og:image, twitter:image, etc.)
-        meta_properties = ['og:image', 'twitter:image', 'twitter:image:src']
-        for prop in meta_properties:
-            for meta_tag in soup.find_all('meta', property=prop):
-                content = meta_tag.get('content')
-                if content:
-                    full_url = self._resolve_url(content, base_url)
-                    if full_url and self._is_valid_image_url(full_url):
-                        images.add(full_url)
-                        logger.debug(
-                            f"Imagem encontrada (meta {prop}): {full_url}")
-
-        # 8. Buscar por URLs de imagem em atributos data-* personalizados
-        for element in soup.find_all(attrs=lambda x: x and any(attr.startswith('data-') and 'img' in attr.lower() for attr in x)):
-            for attr, value in element.attrs.items():
-                if attr.startswith('data-') and 'img' in attr.lower():
-                    full_url = self._resolve_url(value, base_url)
-                    if full_url and self._is_valid_image_url(full_url):
-                        images.add(full_url)
-                        logger.debug(
-                            f"Imagem encontrada (data-* attr): {full_url}")
-
-        # 9. Buscar por padrões de URL de imagem em scripts JSON-LD ou outros scripts
-        for script_tag in soup.find_all('script'):
-            if script_tag.string:
-                # Buscar URLs que parecem ser de imagens
-                img_urls = re.findall(r'["\']([^"\']*\.(?:' + '|'.join(ext[1:] for ext in self.image_extensions) + r'))["\']',
-                                      script_tag.string, re.IGNORECASE)
-                for img_url in img_urls:
-                    full_url = self._resolve_url(img_url, base_url)
-                    if full_url and self._is_valid_image_url(full_url):
-                        images.add(full_url)
-                        logger.debug(f"Imagem encontrada (script): {full_url}")
-
-        return images
+        Args:
+            srcset (str): Valor do atributo srcset
+
+        Returns:
+            List[str]: URLs do srcset
+        """
+        if not srcset:
+            return []
+        return [item.split()[0] for item in srcset.split(',') if item.strip()]
 
     def _resolve_url(self, url: str, base_url: str) -> str:
         """
@@ -314,27 +703,36 @@ class WebsiteScraper:
             base_url (str): URL base
 
         Returns:
-            str: URL absoluta ou None se inválida
+            str: URL absoluta ou None se inválida ou de outro site
         """
         try:
-            if not url or url.startswith('#') or url.startswith('javascript:') or url.startswith('mailto:') or url.startswith('tel:'):
+            if not url or url.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
                 return None
 
             # Limpar a URL
             url = url.strip()
 
-            # Se já é uma URL absoluta, verificar se é do mesmo domínio
-            if url.startswith('http'):
-                return self._normalize_url(url) if self._is_same_domain(url) else url
-
-            # Resolver URL relativa
-            resolved_url = urljoin(base_url, url)
-
-            # Normalizar URL
-            return self._normalize_url(resolved_url)
+            # Caminho rápido: URL absoluta do próprio site (o prefixo já está
+            # normalizado); sem query nem barras repetidas, basta remover o
+            # fragmento. A busca por '//' inclui a barra do próprio prefixo,
+            # para pegar "https://x.com//a"
+            if url.startswith(self._base_prefix) or url == self.base_domain:
+                url = url.partition('#')[0]
+                if '?' not in url and '//' not in url[len(self.base_domain):]:
+                    return url
+                return self._normalize_url(url)
+
+            # Resolver URL relativa ("http-guide.html" também é relativa)
+            if not url.startswith(('http://', 'https://')):
+                url = urljoin(base_url, url)
+
+            # Normalizar URL (sem porta padrão, host em minúsculas) e descartar
+            # URLs de outros sites, que não entram no sitemap
+            normalized = self._normalize_url(url)
+            return normalized if self._is_same_domain(normalized) else None
 
         except Exception as e:
-            logger.debug(f"Erro ao resolver URL {url}: {str(e)}")
+            logger.debug("Erro ao resolver URL %s: %s", url, e)
             return None
 
     def _normalize_url(self, url: str) -> str:
@@ -347,27 +745,7 @@ class WebsiteScraper:
         Returns:
             str: URL normalizada
         """
-        try:
-            parsed = urlparse(url)
-
-            # Remover fragmento
-            normalized = urlunparse((
-                parsed.scheme,
-                parsed.netloc.lower(),
-                parsed.path,
-                parsed.params,
-                parsed.query,
-                ''  # Remover fragmento
-            ))
-
-            # Remover trailing slash para arquivos (mas manter para diretórios)
-            if normalized.endswith('/') and len(parsed.path) > 1 and '.' in parsed.path.split('/')[-1]:
-                normalized = normalized[:-1]
-
-            return normalized
-
-        except Exception:
-            return url
+        return _normalized(url)
 
     def _is_same_domain(self, url: str) -> bool:
         """
@@ -379,12 +757,12 @@ class WebsiteScraper:
         Returns:
             bool: True se mesmo domínio, False caso contrário
         """
-        try:
-            parsed_url = urlparse(url)
-            url_domain = f"{parsed_url.scheme}://{parsed_url.netloc}"
-            return url_domain == self.base_domain
-        except Exception:
-            return False
+        # URLs normalizadas do site começam pelo esquema e host da URL inicial
+        if url.startswith(self._base_prefix):
+            return True
+        # Sem caminho: "http://site.com" ou "http://site.com?q=1"
+        return (url.startswith(self.base_domain)
+                and url[len(self.base_domain):][:1] in ('', '?'))
 
     def _is_valid_page_url(self, url: str) -> bool:
         """
@@ -396,22 +774,18 @@ class WebsiteScraper:
         Returns:
             bool: True se válida, False caso contrário
         """
-        try:
-            parsed = urlparse(url)
-            path = parsed.path.lower()
+        parsed = _parsed(url)
+        path = parsed.path.lower()
 
-            # Verificar extensão
-            if any(path.endswith(ext) for ext in self.allowed_extensions):
-                return True
+        # Verificar extensão
+        if path.endswith(self._allowed_ext_tuple):
+            return True
 
-            # URLs sem extensão (provavelmente páginas dinâmicas)
-            if '.' not in path.split('/')[-1] or path.endswith('/'):
-                return True
+        # URLs sem extensão (provavelmente páginas dinâmicas)
+        if '.' not in path.split('/')[-1] or path.endswith('/'):
+            return True
 
-            return False
-
-        except Exception:
-            return False
+        return False
 
     def _is_valid_resource_url(self, url: str) -> bool:
         """
@@ -423,17 +797,10 @@ class WebsiteScraper:
         Returns:
             bool: True se válida, False caso contrário
         """
-        try:
-            parsed = urlparse(url)
-            path = parsed.path.lower()
-
-            # Recursos que podem ser úteis no sitemap
-            resource_extensions = {'.css', '.js', '.xml', '.txt', '.pdf'}
+        parsed = _parsed(url)
+        path = parsed.path.lower()
 
-            return any(path.endswith(ext) for ext in resource_extensions)
-
-        except Exception:
-            return False
+        return path.endswith(self._RESOURCE_EXTENSIONS)
 
     def _is_valid_image_url(self, url: str) -> bool:
         """
@@ -445,147 +812,278 @@ class WebsiteScraper:
         Returns:
             bool: True se válida, False caso contrário
         """
-        try:
-            parsed = urlparse(url)
-            path = parsed.path.lower()
-
-            # Verificar extensão de imagem
-            if any(path.endswith(ext) for ext in self.image_extensions):
-                return True
-
-            # Verificar se a URL contém indicadores de imagem (mesmo sem extensão clara)
-            image_indicators = ['image', 'img', 'photo',
-                                'picture', 'thumb', 'avatar', 'icon']
-            if any(indicator in path for indicator in image_indicators):
-                # Fazer uma verificação adicional se necessário
-                return True
-
-            # Verificar parâmetros da query que podem indicar imagem
-            if parsed.query:
-                query_lower = parsed.query.lower()
-                if any(ext[1:] in query_lower for ext in self.image_extensions):
-                    return True
+        parsed = _parsed(url)
+        path = parsed.path.lower()
 
-            return False
+        # Verificar extensão de imagem
+        if path.endswith(self._image_ext_tuple):
+            return True
 
-        except Exception:
-            return False
+        # Verificar se a URL contém indicadores de imagem (mesmo sem extensão clara)
+        if self._IMAGE_INDICATOR_RE.search(path):
+            return True
+
+        # Verificar parâmetros da query que podem indicar imagem
+        if parsed.query and self._image_query_re.search(parsed.query.lower()):
+            return True
+
+        return False
 
-    def _make_request(self, url: str) -> requests.Response:
+    async def _make_request(self, session: aiohttp.ClientSession, url: str,
+                            method: Optional[str] = None
+                            ) -> Tuple[Optional[int], Mapping[str, str], bytes, Optional[Dict]]:
         """
-        Faz uma requisição HTTP com tratamento de erros
+        Faz uma requisição HTTP assíncrona com tratamento de erros
+
+        Os cabeçalhos são inspecionados antes do corpo: respostas que não são
+        HTML são abortadas sem download e o HTML é lido até MAX_HTML_BYTES.
+        Links com extensão de arquivo não-HTML (CSS, PDF, ...) recebem um HEAD,
+        que mantém a conexão reaproveitável. Respostas já vistas são
+        revalidadas com ETag/Last-Modified; em caso de 304 Not Modified a
+        entrada do cache (com os links já extraídos) é devolvida no lugar do
+        corpo.
 
         Args:
+            session (aiohttp.ClientSession): Sessão HTTP compartilhada
             url (str): URL para requisição
+            method (str): Método HTTP (por padrão escolhido pela extensão)
 
         Returns:
-            requests.Response: Resposta da requisição ou None em caso de erro
+            Tuple: Status (None em caso de erro), cabeçalhos, corpo da resposta
+                e entrada do cache (apenas em caso de 304)
         """
+        if method is None:
+            is_file = _parsed(url).path.lower().endswith(self._NON_HTML_EXTENSIONS)
+            method = 'HEAD' if is_file else 'GET'
+
+        cached = await self._cache_get(method, url)
         try:
-            response = self.session.get(url, timeout=10, allow_redirects=True)
-            return response
-        except requests.exceptions.RequestException as e:
+            async with session.request(method, url, timeout=_CLIENT_TIMEOUT,
+                                       allow_redirects=True,
+                                       headers=self.response_cache.conditional_headers(cached)) as response:
+                if response.status == 304 and cached:
+                    return 200, cached['headers'], b'', cached
+
+                if method == 'HEAD':
+                    # Servidor sem suporte a HEAD ou extensão enganosa: usar GET
+                    if response.status not in (405, 501) and not self._is_html_response(response.headers):
+                        if response.status == 200:
+                            await self._cache_set('HEAD', url, response.headers)
+                        return response.status, response.headers, b'', None
+                else:
+                    if response.status != 200 or not self._is_html_response(response.headers):
+                        if response.status == 200:
+                            await self._cache_set('GET', url, response.headers)
+                        return response.status, response.headers, b'', None
+
+                    # Ler no máximo MAX_HTML_BYTES, com ou sem Content-Length
+                    chunks = []
+                    size = 0
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= MAX_HTML_BYTES:
+                            break
+                    content = b''.join(chunks)[:MAX_HTML_BYTES]
+                    # O cache é gravado após o parsing, com os links extraídos
+                    return response.status, response.headers, content, None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.warning(f"Erro na requisição para {url}: {str(e)}")
-            return None
+            return None, {}, b'', None
 
-    def _get_last_modified_date(self, url: str) -> str:
+        # O HEAD não serviu; repetir a requisição com GET
+        return await self._make_request(session, url, 'GET')
+
+    async def _cache_get(self, method: str, url: str) -> Optional[Dict]:
         """
-        Obtém a data de última modificação de uma URL
+        Consulta o cache de respostas sem bloquear o event loop
 
         Args:
-            url (str): URL para verificar
+            method (str): Método HTTP
+            url (str): URL da requisição
 
         Returns:
-            str: Data no formato ISO 8601
+            Dict: Entrada do cache ou None
         """
-        try:
-            response = self.session.head(url, timeout=5)
-            if response and 'Last-Modified' in response.headers:
-                import email.utils
-                last_modified = response.headers['Last-Modified']
-                dt = email.utils.parsedate_to_datetime(last_modified)
-                return dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
-        except:
-            pass
+        if not self.response_cache.path:
+            return self.response_cache.get(method, url)
+        # Com cache em disco, a consulta ao SQLite roda fora do event loop
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.response_cache.get, method, url)
+
+    async def _cache_set(self, method: str, url: str, headers: Mapping[str, str],
+                         links: Iterable[str] = (), images: Iterable[str] = ()):
+        """
+        Grava uma resposta no cache sem bloquear o event loop
 
-        # Data atual como fallback
-        return datetime.now().strftime('%Y-%m-%dT%H:%M:%S+00:00')
+        Args:
+            method (str): Método HTTP
+            url (str): URL da requisição
+            headers (Mapping[str, str]): Cabeçalhos da resposta
+            links (Iterable[str]): Links extraídos da página
+            images (Iterable[str]): URLs de imagens extraídas da página
+        """
+        if not self.response_cache.path:
+            self.response_cache.set(method, url, headers, links, images)
+            return
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.response_cache.set, method, url, headers, links, images)
 
-    def _determine_change_frequency(self, url: str) -> str:
+    def _is_html_response(self, headers: Mapping[str, str]) -> bool:
         """
-        Determina a frequência de mudança de uma URL
+        Verifica pelos cabeçalhos se uma resposta é uma página HTML
 
         Args:
-            url (str): URL para analisar
+            headers (Mapping[str, str]): Cabeçalhos da resposta
 
         Returns:
-            str: Frequência de mudança
+            bool: True se HTML, False caso contrário
         """
-        path = urlparse(url).path.lower()
+        return 'text/html' in headers.get('content-type', '').lower()
 
-        # Páginas que mudam frequentemente
-        if any(keyword in path for keyword in ['/blog/', '/news/', '/posts/', '/articles/']):
-            return 'daily'
+    def _response_charset(self, headers: Mapping[str, str]) -> Optional[str]:
+        """
+        Obtém o charset declarado no Content-Type de uma resposta
 
-        # Páginas de produtos ou serviços
-        if any(keyword in path for keyword in ['/products/', '/services/', '/portfolio/']):
-            return 'weekly'
+        Args:
+            headers (Mapping[str, str]): Cabeçalhos da resposta
 
-        # Imagens e recursos estáticos
-        if any(path.endswith(ext) for ext in self.image_extensions):
-            return 'yearly'
+        Returns:
+            str: Nome do charset ou None se não informado
+        """
+        match = _CHARSET_RE.search(headers.get('content-type', ''))
+        return match.group(1) if match else None
 
-        # Páginas estáticas
-        if any(keyword in path for keyword in ['/about/', '/contact/', '/privacy/', '/terms/']):
-            return 'monthly'
+    def _get_last_modified_date(self, url: str) -> str:
+        """
+        Obtém a data de última modificação de uma URL
 
-        # Página inicial
-        if path in ['/', '/index.html', '/index.php']:
-            return 'weekly'
+        Args:
+            url (str): URL para verificar
 
-        # Default
-        return 'monthly'
+        Returns:
+            str: Data no formato ISO 8601
+        """
+        # URLs buscadas no crawl já trazem o Last-Modified da resposta GET;
+        # as demais (imagens) só recebem um HEAD se probe_lastmod estiver ativo
+        last_modified = None
+        if url in self.url_meta:
+            last_modified = self.url_meta[url]
+        elif self.probe_lastmod:
+            cached = self.response_cache.get('HEAD', url)
+            try:
+                response = self.session.head(
+                    url, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                    headers=self.response_cache.conditional_headers(cached))
+                if response.status_code == 304 and cached:
+                    headers = cached['headers']
+                else:
+                    headers = response.headers
+                    self.response_cache.set('HEAD', url, headers)
+                last_modified = self._format_http_date(
+                    headers.get('Last-Modified'))
+            except requests.exceptions.RequestException:
+                pass
+
+        # Data atual como fallback (formatada uma vez por scraping)
+        return (last_modified or self._fallback_lastmod
+                or datetime.now().strftime('%Y-%m-%dT%H:%M:%S+00:00'))
+
+    def _format_http_date(self, value: Optional[str]) -> Optional[str]:
+        """
+        Converte uma data HTTP (ex.: cabeçalho Last-Modified) para ISO 8601
+
+        Args:
+            value (str): Data no formato HTTP
+
+        Returns:
+            str: Data no formato ISO 8601 ou None se ausente/inválida
+        """
+        if not value:
+            return None
+        try:
+            dt = email.utils.parsedate_to_datetime(value)
+            return dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+        except (TypeError, ValueError):
+            return None
+
+    def _build_url_info(self, url: str, start_url: str) -> Dict[str, Any]:
+        """
+        Monta a entrada do sitemap de uma URL
+
+        Args:
+            url (str): URL encontrada no scraping
+            start_url (str): URL inicial do site
+
+        Returns:
+            Dict: URL com lastmod, changefreq e priority
+        """
+        changefreq, priority = self._classify(url, start_url)
+        return {
+            'url': url,
+            'lastmod': self._get_last_modified_date(url),
+            'changefreq': changefreq,
+            'priority': priority
+        }
 
-    def _calculate_priority(self, url: str, start_url: str) -> str:
+    def _classify(self, url: str, start_url: str) -> Tuple[str, float]:
         """
-        Calcula a prioridade de uma URL
+        Determina a frequência de mudança e a prioridade de uma URL
 
         Args:
             url (str): URL para analisar
             start_url (str): URL inicial do site
 
         Returns:
-            str: Prioridade (0.0 a 1.0)
-        """
-        # Página inicial tem prioridade máxima
-        if url == start_url or urlparse(url).path in ['/', '/index.html', '/index.php']:
-            return '1.0'
-
-        path = urlparse(url).path.lower()
-
-        # Páginas importantes
-        if any(keyword in path for keyword in ['/about/', '/contact/', '/services/', '/products/']):
-            return '0.8'
-
-        # Blog e conteúdo
-        if any(keyword in path for keyword in ['/blog/', '/news/', '/articles/']):
-            return '0.7'
-
-        # Imagens têm prioridade baixa mas não muito baixa
-        if any(path.endswith(ext) for ext in self.image_extensions):
-            return '0.4'
-
-        # Recursos estáticos
-        if any(path.endswith(ext) for ext in ['.css', '.js', '.pdf']):
-            return '0.3'
-
-        # Calcular prioridade baseada na profundidade
-        depth = len([p for p in path.split('/') if p])
-        if depth <= 1:
-            return '0.9'
-        elif depth <= 2:
-            return '0.7'
-        elif depth <= 3:
-            return '0.6'
+            Tuple[str, float]: Frequência de mudança e prioridade (0.0 a 1.0)
+        """
+        raw_path = _parsed(url).path
+        path = raw_path.lower()
+        is_image = path.endswith(self._image_ext_tuple)
+
+        # Frequência de mudança
+        if self._DAILY_RE.search(path):
+            # Páginas que mudam frequentemente
+            changefreq = 'daily'
+        elif self._WEEKLY_RE.search(path):
+            # Páginas de produtos ou serviços
+            changefreq = 'weekly'
+        elif is_image:
+            # Imagens e recursos estáticos
+            changefreq = 'yearly'
+        elif path in self._HOME_PATHS:
+            # Página inicial
+            changefreq = 'weekly'
+        else:
+            # Páginas estáticas (/about/, /contact/, ...) e default
+            changefreq = 'monthly'
+
+        # Prioridade
+        if url == start_url or raw_path in self._HOME_PATHS:
+            # Página inicial tem prioridade máxima
+            priority = 1.0
+        elif self._IMPORTANT_RE.search(path):
+            # Páginas importantes
+            priority = 0.8
+        elif self._CONTENT_RE.search(path):
+            # Blog e conteúdo
+            priority = 0.7
+        elif is_image:
+            # Imagens têm prioridade baixa mas não muito baixa
+            priority = 0.4
+        elif path.endswith(self._STATIC_EXTENSIONS):
+            # Recursos estáticos
+            priority = 0.3
         else:
-            return '0.5'
+            # Calcular prioridade baseada na profundidade
+            depth = len([p for p in path.split('/') if p])
+            if depth <= 1:
+                priority = 0.9
+            elif depth <= 2:
+                priority = 0.7
+            elif depth <= 3:
+                priority = 0.6
+            else:
+                priority = 0.5
+
+        return changefreq, priority